@@ -0,0 +1,213 @@
+"""
+Streaming ingest of fleet schedules from the original .xlsx rating workbook.
+- The workbook is opened read-only and each sheet is read row by row, so large
+  schedules (100k+ rows) are rated without holding the sheet in memory.
+- Drones are rated as they are read, cameras once every drone has been seen
+  (they need the highest eligible drone hull rate).
+- Results can be checked against the spreadsheet's own totals.
+
+Expected sheets (headers are matched case-insensitively, spaces = underscores):
+- "Policy":  key | value rows (insured, underwriter, broker, brokerage, max_drones_in_air). Optional.
+- "Drones":  serial_number | value | weight | has_detachable_camera | tpl_limit | tpl_excess
+- "Cameras": serial_number | value
+- "Totals":  line | net | gross, with lines drones_hull, drones_tpl, cameras_hull, total. Optional.
+
+NOTE: The extensions need the whole fleet ranked so are not applied here (as in main()).
+"""
+
+from decimal import Decimal
+
+from memory_report import CHECK_EVERY
+from modelling_case_study import _money, _camera_fields, _net_and_gross
+from rate_plan import get_rate_plan, rated_drone
+
+try:
+    from openpyxl import load_workbook as _load_workbook
+except ImportError:  # Optional - only needed for .xlsx ingest
+    _load_workbook = None
+
+
+POLICY_SHEET = "Policy"
+DRONES_SHEET = "Drones"
+CAMERAS_SHEET = "Cameras"
+TOTALS_SHEET = "Totals"
+
+LINES = ("drones_hull", "drones_tpl", "cameras_hull", "total")
+
+# Cameras are priced in batches of this size (keeps memory flat on long sheets)
+CAMERA_BATCH_SIZE = 1000
+
+
+def open_workbook(path):
+    """
+    Open a workbook in streaming (read-only) mode.
+    """
+    if _load_workbook is None:
+        raise ImportError("openpyxl is required to read .xlsx workbooks (pip install openpyxl)")
+    return _load_workbook(path, read_only=True, data_only=True)
+
+
+def _key(header) -> str:
+    return str(header).strip().lower().replace(" ", "_")
+
+
+def _flag(x) -> bool:
+    """
+    Excel booleans may come through as TRUE/FALSE, Yes/No, Y/N or 1/0.
+    """
+    if isinstance(x, str):
+        return x.strip().lower() in ("true", "yes", "y", "1")
+    return bool(x)
+
+
+def iter_rows(ws):
+    """
+    Yield each row under the header as a dict (fully empty rows are skipped).
+    """
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    keys = [_key(h) if h is not None else None for h in header]
+
+    for row in rows:
+        if all(v is None for v in row):
+            continue
+        yield {k: v for k, v in zip(keys, row) if k is not None}
+
+
+def read_policy_header(wb) -> dict:
+    """
+    Read the optional "Policy" sheet as {key: value}.
+    """
+    if POLICY_SHEET not in wb.sheetnames:
+        return {}
+
+    header = {}
+    for row in wb[POLICY_SHEET].iter_rows(values_only=True):
+        if row and row[0] is not None:
+            header[_key(row[0])] = row[1] if len(row) > 1 else None
+    return header
+
+
+def iter_drones(wb):
+    """
+    Yield drone input dicts from the "Drones" sheet.
+    """
+    for row in iter_rows(wb[DRONES_SHEET]):
+        yield {
+            "serial_number": row.get("serial_number"),
+            "value": row["value"],
+            "weight": str(row["weight"]).strip(),
+            "has_detachable_camera": _flag(row.get("has_detachable_camera")),
+            "tpl_limit": row["tpl_limit"],
+            "tpl_excess": row["tpl_excess"] or 0,
+        }
+
+
+def iter_cameras(wb):
+    """
+    Yield camera input dicts from the "Cameras" sheet.
+    """
+    if CAMERAS_SHEET not in wb.sheetnames:
+        return
+    for row in iter_rows(wb[CAMERAS_SHEET]):
+        yield {"serial_number": row.get("serial_number"), "value": row["value"]}
+
+
+def iter_rated_drones(wb, plan=None):
+    """
+    Yield each drone from the workbook already rated (HULL & TPL).
+    """
+    plan = plan or get_rate_plan()
+    for drone in iter_drones(wb):
+        yield rated_drone(drone, plan)
+
+
+def read_sheet_totals(wb):
+    """
+    Read the spreadsheet's own totals as {"net_prem": {...}, "gross_prem": {...}}, or None if absent.
+    """
+    if TOTALS_SHEET not in wb.sheetnames:
+        return None
+
+    totals = {"net_prem": {}, "gross_prem": {}}
+    for row in iter_rows(wb[TOTALS_SHEET]):
+        line = _key(row.get("line"))
+        if line in LINES:
+            totals["net_prem"][line] = row.get("net")
+            totals["gross_prem"][line] = row.get("gross")
+    return totals
+
+
+def check_against_sheet(result: dict, sheet_totals: dict) -> list:
+    """
+    Compare rated totals to the spreadsheet's totals to the penny.
+    Returns a list of mismatches: {"basis", "line", "model", "sheet"}.
+    """
+    mismatches = []
+    for basis in ("net_prem", "gross_prem"):
+        for line, sheet_value in sheet_totals[basis].items():
+            if sheet_value is None:
+                continue
+            model_value = result[basis][line]
+            if _money(model_value) != _money(sheet_value):
+                mismatches.append({"basis": basis, "line": line, "model": model_value, "sheet": sheet_value})
+    return mismatches
+
+
+def rate_workbook(path, brokerage=None, plan=None, monitor=None) -> dict:
+    """
+    Stream a rating workbook through the rating pipeline and return the policy totals.
+    brokerage overrides the "Policy" sheet value.
+    The optional memory monitor's budget is checked every CHECK_EVERY drones and per camera batch.
+    The result also holds the drone/camera counts and any mismatches against the "Totals" sheet.
+    """
+    plan = plan or get_rate_plan()
+    wb = open_workbook(path)
+    try:
+        result = read_policy_header(wb)
+        if brokerage is not None:
+            result["brokerage"] = brokerage
+        if result.get("brokerage") is None:
+            raise ValueError("No brokerage given and none found on the Policy sheet")
+
+        # 1) Drones - rate row by row, keep only running sums & the max eligible hull rate
+        net = {"drones_hull": Decimal("0"), "drones_tpl": Decimal("0"), "cameras_hull": Decimal("0")}
+        drone_count = 0
+        max_rate = None
+        for drone in iter_rated_drones(wb, plan):
+            drone_count += 1
+            net["drones_hull"] += Decimal(str(drone["hull_premium"]))
+            net["drones_tpl"] += Decimal(str(drone["tpl_layer_premium"]))
+            if drone["has_detachable_camera"] and (max_rate is None or drone["hull_final_rate"] > max_rate):
+                max_rate = drone["hull_final_rate"]
+            if monitor is not None and drone_count % CHECK_EVERY == 0:
+                monitor.check("rate_workbook.drones")
+
+        # 2) Cameras - priced in batches at the max eligible rate (or 0 with no eligible drones)
+        eligible = [{"has_detachable_camera": True, "hull_final_rate": max_rate}] if max_rate is not None else []
+        camera_count = 0
+        batch = []
+        for cam in iter_cameras(wb):
+            batch.append(cam)
+            if len(batch) >= CAMERA_BATCH_SIZE:
+                net["cameras_hull"] += sum(Decimal(str(f["hull_premium"])) for f in _camera_fields(eligible, batch))
+                camera_count += len(batch)
+                batch = []
+                if monitor is not None:
+                    monitor.check("rate_workbook.cameras")
+        net["cameras_hull"] += sum(Decimal(str(f["hull_premium"])) for f in _camera_fields(eligible, batch))
+        camera_count += len(batch)
+
+        # 3) Totals & check against the spreadsheet
+        result["net_prem"], result["gross_prem"] = _net_and_gross(net, result["brokerage"])
+        result["drone_count"] = drone_count
+        result["camera_count"] = camera_count
+
+        sheet_totals = read_sheet_totals(wb)
+        result["mismatches"] = check_against_sheet(result, sheet_totals) if sheet_totals else []
+    finally:
+        wb.close()
+
+    return result
@@ -0,0 +1,77 @@
+"""
+Derive max_drones_in_air from telemetry flight logs.
+- Each flight is a (take_off, landing) interval; times can be anything orderable (numbers, datetimes).
+- Intervals are half-open: a drone landing at t and another taking off at t are not in the air together.
+- Intervals are streamed in chunks and folded into net take-off/landing counts per timestamp,
+  then a sweep-line over the sorted timestamps finds the peak (O(n log n)).
+- The observed peak replaces the declared figure used by Extension 1 & 2.
+"""
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from pure_rating import rate_policy
+
+
+def _event_deltas(chunks) -> dict:
+    """
+    Fold chunks of (take_off, landing) intervals into {timestamp: net change in drones in the air}.
+    """
+    deltas = defaultdict(int)
+    for chunk in chunks:
+        for take_off, landing in chunk:
+            if landing < take_off:
+                raise ValueError(f"Landing before take-off: {(take_off, landing)}")
+            deltas[take_off] += 1
+            deltas[landing] -= 1
+    return deltas
+
+
+def peak_concurrent_chunks(chunks) -> int:
+    """
+    Peak number of drones in the air at once, streaming the intervals chunk by chunk.
+    """
+    deltas = _event_deltas(chunks)
+
+    peak = in_air = 0
+    for t in sorted(deltas):
+        in_air += deltas[t]
+        peak = max(peak, in_air)
+    return peak
+
+
+def peak_concurrent(intervals) -> int:
+    """
+    Peak number of drones in the air at once for a single iterable of intervals.
+    """
+    return peak_concurrent_chunks([intervals])
+
+
+def peak_by_fleet(fleets: dict, max_workers: int = None, executor=None) -> dict:
+    """
+    Peak concurrent drones for each fleet, {fleet: chunks} -> {fleet: peak}.
+    By default fleets run on a thread pool, which is only parallel on a free-threaded (no-GIL) build.
+    On a GIL build pass a ProcessPoolExecutor as executor for real parallelism
+    (the chunks must then be picklable, e.g. lists rather than generators).
+    """
+    names = list(fleets)
+    if executor is not None:
+        return dict(zip(names, executor.map(peak_concurrent_chunks, [fleets[n] for n in names])))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(zip(names, pool.map(peak_concurrent_chunks, [fleets[n] for n in names])))
+
+
+def with_observed_peak(model_data: dict, peak: int) -> dict:
+    """
+    Return a new policy using the observed peak as max_drones_in_air.
+    The client's figure is kept as declared_max_drones_in_air.
+    """
+    return {**model_data, "declared_max_drones_in_air": model_data.get("max_drones_in_air"), "max_drones_in_air": peak}
+
+
+def rate_policy_from_logs(model_data: dict, chunks) -> dict:
+    """
+    Rate a policy with the extensions applied, using the peak from its flight logs.
+    """
+    return rate_policy(with_observed_peak(model_data, peak_concurrent_chunks(chunks)), extensions=True)
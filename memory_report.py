@@ -0,0 +1,186 @@
+"""
+Optional memory instrumentation for the rating stages.
+- tracemalloc gives the peak and net Python allocations of each stage (also per 1k drones).
+- RSS (what the OS sees) is sampled at each check.
+- A budget makes batch runs fail fast (MemoryBudgetExceeded), or call an on_exceed hook
+  (e.g. to spill results to disk) before the OS kills the process.
+- The batch runners (pure_rating.rate_policies, rate_plan.rate_policy, portfolio_store.rate_store,
+  excel_ingest.rate_workbook) take an optional monitor and call check() every CHECK_EVERY rows or per chunk.
+- A budget on its own only samples RSS; tracemalloc is only switched on with trace=True.
+"""
+
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+
+from modelling_case_study import rate_hull_for_drone, rate_tpl_for_drone, rate_cameras, apply_drone_extension, apply_camera_extension, compute_totals
+
+
+# Budget is re-checked every this many drones / policies inside a stage or batch
+CHECK_EVERY = 1000
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """
+    Raised when memory use goes over the monitor's budget (and there is no on_exceed hook).
+    """
+
+    def __init__(self, stage: str, used_bytes: int, budget_bytes: int):
+        super().__init__(f"{stage}: {used_bytes} bytes used, budget is {budget_bytes} bytes")
+        self.stage = stage
+        self.used_bytes = used_bytes
+        self.budget_bytes = budget_bytes
+
+
+def _rss_bytes():
+    """
+    Current resident set size in bytes (peak RSS where the current value isn't available), or None.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _per_1k(n_bytes: int, drones: int):
+    return n_bytes * 1000 / drones if drones else None
+
+
+class MemoryMonitor:
+    """
+    Records memory use per rating stage.
+    - budget_bytes: limit on RSS (or traced memory if RSS is unavailable). None = no limit.
+    - on_exceed: optional callback(stage, used_bytes) used instead of raising, e.g. to spill.
+    - trace: measure stages with tracemalloc. With trace=False stages only check the budget (RSS)
+      and add no reports, avoiding tracemalloc's overhead.
+    """
+
+    def __init__(self, budget_bytes: int = None, on_exceed=None, trace: bool = True):
+        self.budget_bytes = budget_bytes
+        self.on_exceed = on_exceed
+        self.trace = trace
+        self.reports = []
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def check(self, stage: str) -> None:
+        """
+        Compare current memory use to the budget.
+        """
+        if self.budget_bytes is None:
+            return
+
+        used = _rss_bytes()
+        if used is None:
+            used = tracemalloc.get_traced_memory()[0]   # 0 when not tracing
+        if used <= self.budget_bytes:
+            return
+
+        if self.on_exceed is not None:
+            self.on_exceed(stage, used)
+        else:
+            raise MemoryBudgetExceeded(stage, used, self.budget_bytes)
+
+    @contextmanager
+    def stage(self, name: str, drones: int = 0):
+        """
+        Measure one stage. Appends {stage, drones, peak_bytes, net_bytes, rss_bytes, ...per_1k_drones} to reports.
+        """
+        if not self.trace:
+            yield self
+            self.check(name)
+            return
+
+        self.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+
+        yield self
+
+        current, peak = tracemalloc.get_traced_memory()
+        self.reports.append({
+            "stage": name,
+            "drones": drones,
+            "peak_bytes": peak - before,
+            "net_bytes": current - before,
+            "rss_bytes": _rss_bytes(),
+            "peak_per_1k_drones": _per_1k(peak - before, drones),
+            "net_per_1k_drones": _per_1k(current - before, drones),
+        })
+        self.check(name)
+
+
+def format_report(reports: list) -> str:
+    """
+    Format stage reports as a plain-text table (sizes in KiB).
+    """
+    def kib(x):
+        return "-" if x is None else f"{x / 1024:,.1f}"
+
+    lines = [f"{'stage':<18}{'drones':>8}{'peak KiB':>12}{'net KiB':>12}{'peak/1k':>12}{'RSS KiB':>14}"]
+    for r in reports:
+        lines.append(
+            f"{r['stage']:<18}{r['drones']:>8}{kib(r['peak_bytes']):>12}{kib(r['net_bytes']):>12}"
+            f"{kib(r['peak_per_1k_drones']):>12}{kib(r['rss_bytes']):>14}"
+        )
+    return "\n".join(lines)
+
+
+def profile_rating(model_data: dict, monitor: MemoryMonitor = None, extensions: bool = False) -> tuple:
+    """
+    Rate model_data in place (as main() does) measuring each stage.
+    Returns (model_data, reports).
+    """
+    monitor = monitor or MemoryMonitor()
+    n = len(model_data["drones"])
+
+    with monitor:
+        # --- HULL & TPL for drones ---
+        with monitor.stage("hull_tpl", n):
+            for i, drone in enumerate(model_data["drones"], 1):
+                rate_hull_for_drone(drone)
+                rate_tpl_for_drone(drone)
+                if i % CHECK_EVERY == 0:
+                    monitor.check("hull_tpl")
+
+        # --- CAMERAS ---
+        with monitor.stage("cameras", n):
+            rate_cameras(model_data)
+
+        # --- EXTENSIONS ---
+        if extensions:
+            with monitor.stage("drone_extension", n):
+                apply_drone_extension(model_data)
+            with monitor.stage("camera_extension", n):
+                apply_camera_extension(model_data)
+
+        # --- NET & GROSS Totals ---
+        with monitor.stage("totals", n):
+            compute_totals(model_data)
+
+    return model_data, monitor.reports
@@ -5,7 +5,7 @@ Starter data for the UAV rating model.
 - tpl_limit and tpl_excess manually added so the file runs. 
 """
 
-from rating_constants import HULL_BASE_RATE, WEIGHT_ADJUSTMENT, TPL_BASE_RATE, TPL_ILF, DRONE_INACTIVE_FLAT_PREMIUM, CAMERA_INACTIVE_FLAT_PREMIUM 
+import rating_constants
 from decimal import Decimal, ROUND_HALF_UP
 
 def get_example_data():
@@ -153,21 +153,32 @@ def rate_hull_for_drone(drone: dict) -> dict:
     hull_premium = value * final_rate
     """
 
+    drone.update(_hull_fields(drone))
+    return drone
+
+
+def _hull_fields(drone: dict) -> dict:
+    """
+    Compute the HULL fields for a single drone without touching the drone.
+    final_rate = base_rate * weight_adjustment
+    hull_premium = value * final_rate
+    """
+
     # 1) Base + Adjustment
-    base = HULL_BASE_RATE
-    adj = WEIGHT_ADJUSTMENT[drone["weight"]]
+    base = rating_constants.HULL_BASE_RATE
+    adj = rating_constants.WEIGHT_ADJUSTMENT[drone["weight"]]
 
     # 2) Final Rate & Premium (as Decimal)
     final_rate = base * adj
     premium = Decimal(drone["value"]) * final_rate
 
-    # 3) Store (round to 2 dp)
-    drone["hull_base_rate"] = float(base)
-    drone["hull_weight_adjustment"] = float(adj)
-    drone["hull_final_rate"] = float(final_rate)
-    drone["hull_premium"] = _money(premium)
-
-    return drone
+    # 3) Fields (round to 2 dp)
+    return {
+        "hull_base_rate": float(base),
+        "hull_weight_adjustment": float(adj),
+        "hull_final_rate": float(final_rate),
+        "hull_premium": _money(premium),
+    }
 
 
 def rate_tpl_for_drone(drone: dict) -> dict:
@@ -176,25 +187,36 @@ def rate_tpl_for_drone(drone: dict) -> dict:
     base_layer_premium = value * TPL_BASE_RATE
     layer_premium = base_layer_premium * ILF(limit, excess)
     """
-    
+
+    drone.update(_tpl_fields(drone))
+    return drone
+
+
+def _tpl_fields(drone: dict) -> dict:
+    """
+    Compute the TPL fields for a single drone without touching the drone.
+    base_layer_premium = value * TPL_BASE_RATE
+    layer_premium = base_layer_premium * ILF(limit, excess)
+    """
+
     # 1) Base Rate & Base Layer Premium
-    base_rate = TPL_BASE_RATE 
+    base_rate = rating_constants.TPL_BASE_RATE
     base_layer_premium = Decimal(drone["value"]) * base_rate
 
     # 2) ILF lookup (limit, excess)
     limit_dec = Decimal(drone["tpl_limit"])
     excess_dec = Decimal(drone["tpl_excess"])
-    ilf = TPL_ILF[(limit_dec, excess_dec)]
+    ilf = rating_constants.TPL_ILF[(limit_dec, excess_dec)]
 
-    # 3) Layer Premium (NET) & Store (round to 2 dp)
+    # 3) Layer Premium (NET) (round to 2 dp)
     layer_prem = base_layer_premium * ilf
 
-    drone["tpl_base_rate"] = float(base_rate)
-    drone["tpl_base_layer_premium"] = _money(base_layer_premium)
-    drone["tpl_ilf"] = float(ilf)
-    drone["tpl_layer_premium"] = _money(layer_prem)
-
-    return drone
+    return {
+        "tpl_base_rate": float(base_rate),
+        "tpl_base_layer_premium": _money(base_layer_premium),
+        "tpl_ilf": float(ilf),
+        "tpl_layer_premium": _money(layer_prem),
+    }
 
 
 def rate_cameras(model_data: dict) -> None:
@@ -204,26 +226,29 @@ def rate_cameras(model_data: dict) -> None:
     Then compuye each camera's hull_premium (NET). 
     """
 
-    drones = model_data["drones"]
+    cams = model_data["detachable_cameras"]
+    for cam, fields in zip(cams, _camera_fields(model_data["drones"], cams)):
+        cam.update(fields)
+
+
+def _camera_fields(drones: list, cams: list) -> list:
+    """
+    Compute the hull fields for each camera (same order as cams).
+    hull_rate = highest hull_final_rate among drones with a detachable camera.
+    """
 
     # Eligible drones for camera attachment
     eligible = [d for d in drones if d.get("has_detachable_camera")]
 
     # If no eligible drones, no camera rate to apply
     if not eligible:
-        for cam in model_data["detachable_cameras"]:
-            cam["hull_rate"] = 0.0
-            cam["hull_premium"] = 0.0
-        return
-    
+        return [{"hull_rate": 0.0, "hull_premium": 0.0} for _ in cams]
+
     # Max hull_final_rate among eligible drones
     max_rate = max(d["hull_final_rate"] for d in eligible)
+    rate = Decimal(str(max_rate))
 
-    # Apply to each camera
-    for cam in model_data["detachable_cameras"]:
-        cam["hull_rate"] = float(max_rate)
-        prem = Decimal(cam["value"]) * Decimal(str(max_rate))
-        cam["hull_premium"] = _money(prem)
+    return [{"hull_rate": float(max_rate), "hull_premium": _money(Decimal(cam["value"]) * rate)} for cam in cams]
 
 
 def compute_totals(model_data: dict) -> None:
@@ -232,30 +257,46 @@ def compute_totals(model_data: dict) -> None:
         gross = net / (1 - brokerage)
     """
 
-    # --- NET Totals ---
-    net_drones_hull = sum(Decimal(str(d["hull_premium"])) for d in model_data["drones"])
-    net_drones_tpl = sum(Decimal(str(d["tpl_layer_premium"])) for d in model_data["drones"])
-    net_cameras_hull = sum(Decimal(str(cam["hull_premium"])) for cam in model_data["detachable_cameras"])
-    net_total = net_drones_hull + net_drones_tpl + net_cameras_hull
+    net_prem, gross_prem = _totals(model_data)
+    model_data["net_prem"].update(net_prem)
+    model_data["gross_prem"].update(gross_prem)
 
-    # --- Store NET Totals ---
-    model_data["net_prem"]["drones_hull"] = _money(net_drones_hull)
-    model_data["net_prem"]["drones_tpl"] = _money(net_drones_tpl)
-    model_data["net_prem"]["cameras_hull"] = _money(net_cameras_hull)
-    model_data["net_prem"]["total"] = _money(net_total)
+
+def _totals(model_data: dict) -> tuple:
+    """
+    Compute the (net_prem, gross_prem) totals dicts without touching model_data.
+        gross = net / (1 - brokerage)
+    """
+
+    return _net_and_gross(_net_sums(model_data), model_data["brokerage"])
+
+
+def _net_sums(model_data: dict) -> dict:
+    """
+    Unrounded NET line sums (drones_hull, drones_tpl, cameras_hull) as Decimal.
+    """
+
+    return {
+        "drones_hull": sum(Decimal(str(d["hull_premium"])) for d in model_data["drones"]),
+        "drones_tpl": sum(Decimal(str(d["tpl_layer_premium"])) for d in model_data["drones"]),
+        "cameras_hull": sum(Decimal(str(cam["hull_premium"])) for cam in model_data["detachable_cameras"]),
+    }
+
+
+def _net_and_gross(net: dict, brokerage) -> tuple:
+    """
+    Round the NET line sums (drones_hull, drones_tpl, cameras_hull) and derive GROSS from them.
+    Returns the (net_prem, gross_prem) totals dicts, including "total".
+    """
+
+    net = {**net, "total": net["drones_hull"] + net["drones_tpl"] + net["cameras_hull"]}
 
     # --- GROSS From NET ---
-    factor = Decimal("1") - Decimal(str(model_data["brokerage"]))   # 0.70
-    gross_drones_hull = net_drones_hull / factor
-    gross_drones_tpl = net_drones_tpl / factor
-    gross_cameras_hull = net_cameras_hull / factor
-    gross_total = net_total / factor
+    factor = Decimal("1") - Decimal(str(brokerage))   # 0.70
 
-    # --- Store GROSS Totals ---
-    model_data["gross_prem"]["drones_hull"] = _money(gross_drones_hull)
-    model_data["gross_prem"]["drones_tpl"] = _money(gross_drones_tpl)
-    model_data["gross_prem"]["cameras_hull"] = _money(gross_cameras_hull)
-    model_data["gross_prem"]["total"] = _money(gross_total)
+    net_prem = {line: _money(value) for line, value in net.items()}
+    gross_prem = {line: _money(value / factor) for line, value in net.items()}
+    return net_prem, gross_prem
 
 
 def apply_drone_extension(model_data: dict) -> None:
@@ -266,8 +307,21 @@ def apply_drone_extension(model_data: dict) -> None:
     NOTE: I'm going to allocate the flat £150 to the hull and set the TPL to 0.
     """
 
+    drones = model_data["drones"]
+    for i in _extra_drone_indices(model_data):
+        drones[i]["hull_premium"] = _money(rating_constants.DRONE_INACTIVE_FLAT_PREMIUM)
+        drones[i]["tpl_layer_premium"] = 0.0
+
+
+def _extra_drone_indices(model_data: dict) -> list:
+    """
+    Indices of the drones that fall outside the top n (by hull + tpl NET) for Extension 1.
+    """
+
     n = model_data["max_drones_in_air"]
     drones = model_data["drones"]
+    if not drones:
+        return []
 
     # 1) Compute the NET total for each drone
     totals = [d["hull_premium"] + d["tpl_layer_premium"] for d in drones]
@@ -280,14 +334,10 @@ def apply_drone_extension(model_data: dict) -> None:
     else:
         threshold = top_n[0] + 1  # If n=0, set threshold above max so all get flat rate
 
-    # 3) Keep drones >= threshold, set others to flat £150
-    for d in drones:
-        net_total = d["hull_premium"] + d["tpl_layer_premium"]
-        if net_total < threshold:
-            d["hull_premium"] = _money(DRONE_INACTIVE_FLAT_PREMIUM)
-            d["tpl_layer_premium"] = 0.0
+    # 3) Drones below the threshold are extras
+    return [i for i, total in enumerate(totals) if total < threshold]
+
 
-    
 def apply_camera_extension(model_data: dict) -> None:
     """
     Extension 2:
@@ -297,6 +347,16 @@ def apply_camera_extension(model_data: dict) -> None:
     - (If total drones < max_drones_in_air, n = total drones).
     """
 
+    cams = model_data["detachable_cameras"]
+    for i in _extra_camera_indices(model_data):
+        cams[i]["hull_premium"] = _money(rating_constants.CAMERA_INACTIVE_FLAT_PREMIUM)
+
+
+def _extra_camera_indices(model_data: dict) -> list:
+    """
+    Indices of the cameras that fall outside the top n (by value) for Extension 2.
+    """
+
     cams = model_data["detachable_cameras"]
 
     total_drones = len(model_data["drones"])
@@ -305,11 +365,8 @@ def apply_camera_extension(model_data: dict) -> None:
     n = max_drones if total_drones >= max_drones else total_drones
 
     if len(cams) <= n:
-        return
-
-    # 1) Sort the cameras by value (desc)
-    sorted_cams = sorted(cams, key=lambda c: c["value"], reverse=True)
+        return []
 
-    # 2) Keep top n, set others to flat £50
-    for cam in sorted_cams[n:]:
-        cam["hull_premium"] = _money(CAMERA_INACTIVE_FLAT_PREMIUM)
\ No newline at end of file
+    # Sort the cameras by value (desc), everything after the top n is an extra
+    order = sorted(range(len(cams)), key=lambda i: cams[i]["value"], reverse=True)
+    return order[n:]
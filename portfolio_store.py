@@ -0,0 +1,222 @@
+"""
+Local SQLite store for policies, drones, cameras and rated premiums.
+- Tables mirror the model: policy header (+ net_prem / gross_prem), drones, cameras.
+- Bulk loads use batched executemany, one transaction per batch.
+- The database runs in WAL mode so readers are not blocked while results are written.
+- Policies are read back in chunks (same dict shape as get_example_data) to feed the rating pipeline,
+  and rated NET/GROSS totals are written back in bulk.
+"""
+
+import sqlite3
+
+from pure_rating import rate_policy
+
+
+LINES = ("drones_hull", "drones_tpl", "cameras_hull", "total")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS policies (
+    policy_id INTEGER PRIMARY KEY,
+    insured TEXT,
+    underwriter TEXT,
+    broker TEXT,
+    brokerage REAL NOT NULL,
+    max_drones_in_air INTEGER NOT NULL,
+    net_drones_hull REAL,
+    net_drones_tpl REAL,
+    net_cameras_hull REAL,
+    net_total REAL,
+    gross_drones_hull REAL,
+    gross_drones_tpl REAL,
+    gross_cameras_hull REAL,
+    gross_total REAL
+);
+
+CREATE TABLE IF NOT EXISTS drones (
+    policy_id INTEGER NOT NULL REFERENCES policies (policy_id),
+    position INTEGER NOT NULL,
+    serial_number TEXT,
+    value NUMERIC NOT NULL,
+    weight TEXT NOT NULL,
+    has_detachable_camera INTEGER NOT NULL,
+    tpl_limit NUMERIC NOT NULL,
+    tpl_excess NUMERIC NOT NULL,
+    PRIMARY KEY (policy_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS cameras (
+    policy_id INTEGER NOT NULL REFERENCES policies (policy_id),
+    position INTEGER NOT NULL,
+    serial_number TEXT,
+    value NUMERIC NOT NULL,
+    PRIMARY KEY (policy_id, position)
+) WITHOUT ROWID;
+"""
+
+_PREMIUM_COLUMNS = [f"net_{line}" for line in LINES] + [f"gross_{line}" for line in LINES]
+
+_INSERT_POLICY = (
+    "INSERT INTO policies (policy_id, insured, underwriter, broker, brokerage, max_drones_in_air) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_INSERT_DRONE = "INSERT INTO drones VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_CAMERA = "INSERT INTO cameras VALUES (?, ?, ?, ?)"
+_UPDATE_PREMIUMS = (
+    "UPDATE policies SET " + ", ".join(f"{c} = ?" for c in _PREMIUM_COLUMNS) + " WHERE policy_id = ?"
+)
+
+
+def connect(path) -> sqlite3.Connection:
+    """
+    Open (or create) a store in WAL mode with the schema in place.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def bulk_load(conn: sqlite3.Connection, policies, batch_size: int = 10000) -> int:
+    """
+    Insert policies (get_example_data shape) in batches of batch_size policies.
+    Policies without a policy_id are given the next free one.
+    Returns the number of policies loaded.
+    """
+    next_id = conn.execute("SELECT COALESCE(MAX(policy_id), 0) + 1 FROM policies").fetchone()[0]
+    policy_rows, drone_rows, camera_rows = [], [], []
+    loaded = 0
+
+    def flush():
+        with conn:
+            conn.executemany(_INSERT_POLICY, policy_rows)
+            conn.executemany(_INSERT_DRONE, drone_rows)
+            conn.executemany(_INSERT_CAMERA, camera_rows)
+        policy_rows.clear()
+        drone_rows.clear()
+        camera_rows.clear()
+
+    for policy in policies:
+        policy_id = policy.get("policy_id")
+        if policy_id is None:
+            policy_id = next_id
+        next_id = max(next_id, policy_id + 1)
+
+        policy_rows.append((
+            policy_id, policy.get("insured"), policy.get("underwriter"), policy.get("broker"),
+            policy["brokerage"], policy["max_drones_in_air"],
+        ))
+        drone_rows.extend(
+            (policy_id, i, d.get("serial_number"), d["value"], d["weight"],
+             int(bool(d.get("has_detachable_camera"))), d["tpl_limit"], d["tpl_excess"])
+            for i, d in enumerate(policy["drones"])
+        )
+        camera_rows.extend(
+            (policy_id, i, c.get("serial_number"), c["value"])
+            for i, c in enumerate(policy["detachable_cameras"])
+        )
+
+        loaded += 1
+        if len(policy_rows) >= batch_size:
+            flush()
+
+    if policy_rows:
+        flush()
+    return loaded
+
+
+def iter_policy_chunks(conn: sqlite3.Connection, chunk_size: int = 1000):
+    """
+    Yield lists of up to chunk_size policies (get_example_data shape, plus policy_id), in policy_id order.
+    """
+    last_id = 0
+    while True:
+        headers = conn.execute(
+            "SELECT policy_id, insured, underwriter, broker, brokerage, max_drones_in_air, "
+            + ", ".join(_PREMIUM_COLUMNS)
+            + " FROM policies WHERE policy_id > ? ORDER BY policy_id LIMIT ?",
+            (last_id, chunk_size),
+        ).fetchall()
+        if not headers:
+            return
+
+        first_id, last_id = headers[0][0], headers[-1][0]
+        chunk = {}
+        for row in headers:
+            premiums = row[6:]
+            chunk[row[0]] = {
+                "policy_id": row[0],
+                "insured": row[1],
+                "underwriter": row[2],
+                "broker": row[3],
+                "brokerage": row[4],
+                "max_drones_in_air": row[5],
+                "drones": [],
+                "detachable_cameras": [],
+                "net_prem": dict(zip(LINES, premiums[:4])),
+                "gross_prem": dict(zip(LINES, premiums[4:])),
+            }
+
+        for row in conn.execute(
+            "SELECT policy_id, serial_number, value, weight, has_detachable_camera, tpl_limit, tpl_excess "
+            "FROM drones WHERE policy_id BETWEEN ? AND ? ORDER BY policy_id, position",
+            (first_id, last_id),
+        ):
+            chunk[row[0]]["drones"].append({
+                "serial_number": row[1],
+                "value": row[2],
+                "weight": row[3],
+                "has_detachable_camera": bool(row[4]),
+                "tpl_limit": row[5],
+                "tpl_excess": row[6],
+            })
+
+        for row in conn.execute(
+            "SELECT policy_id, serial_number, value FROM cameras "
+            "WHERE policy_id BETWEEN ? AND ? ORDER BY policy_id, position",
+            (first_id, last_id),
+        ):
+            chunk[row[0]]["detachable_cameras"].append({"serial_number": row[1], "value": row[2]})
+
+        yield list(chunk.values())
+
+
+def write_results(conn: sqlite3.Connection, results, batch_size: int = 50000) -> int:
+    """
+    Write rated net_prem / gross_prem back for each result (matched on policy_id).
+    Returns the number of policies written.
+    """
+    rows = []
+    written = 0
+
+    def flush():
+        with conn:
+            conn.executemany(_UPDATE_PREMIUMS, rows)
+        rows.clear()
+
+    for result in results:
+        net, gross = result["net_prem"], result["gross_prem"]
+        rows.append(tuple(net[line] for line in LINES) + tuple(gross[line] for line in LINES) + (result["policy_id"],))
+        written += 1
+        if len(rows) >= batch_size:
+            flush()
+
+    if rows:
+        flush()
+    return written
+
+
+def rate_store(conn: sqlite3.Connection, rate_fn=rate_policy, chunk_size: int = 1000, extensions: bool = False,
+               monitor=None) -> int:
+    """
+    Rate every stored policy chunk by chunk and write the totals back.
+    The optional memory monitor's budget is checked after each chunk is rated, before it is written.
+    Returns the number of policies rated.
+    """
+    rated = 0
+    for chunk in iter_policy_chunks(conn, chunk_size):
+        results = [rate_fn(p, extensions=extensions) for p in chunk]
+        if monitor is not None:
+            monitor.check("rate_store")
+        rated += write_results(conn, results)
+    return rated
@@ -0,0 +1,116 @@
+"""
+Side-effect-free version of the rating pipeline.
+- Every function returns new dicts/lists and never mutates its input.
+- The same input policy can be shared between threads or re-rated stage by stage.
+- Uses the same calculations (and rounding) as modelling_case_study.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import rating_constants
+from modelling_case_study import (
+    _money,
+    _hull_fields,
+    _tpl_fields,
+    _camera_fields,
+    _totals,
+    _extra_drone_indices,
+    _extra_camera_indices,
+)
+from memory_report import CHECK_EVERY
+
+
+def rated_hull(drone: dict) -> dict:
+    """
+    Return a new drone with the HULL fields filled (input drone is untouched).
+    """
+    return {**drone, **_hull_fields(drone)}
+
+
+def rated_tpl(drone: dict) -> dict:
+    """
+    Return a new drone with the TPL fields filled (input drone is untouched).
+    """
+    return {**drone, **_tpl_fields(drone)}
+
+
+def rated_drones(model_data: dict) -> dict:
+    """
+    Return a new policy with HULL & TPL filled for every drone.
+    """
+    drones = [{**d, **_hull_fields(d), **_tpl_fields(d)} for d in model_data["drones"]]
+    return {**model_data, "drones": drones}
+
+
+def rated_cameras(model_data: dict) -> dict:
+    """
+    Return a new policy with every camera rated at the highest eligible drone hull rate.
+    """
+    cams = model_data["detachable_cameras"]
+    fields = _camera_fields(model_data["drones"], cams)
+    return {**model_data, "detachable_cameras": [{**cam, **f} for cam, f in zip(cams, fields)]}
+
+
+def with_drone_extension(model_data: dict) -> dict:
+    """
+    Return a new policy with Extension 1 applied (extras get a flat £150 NET on the hull).
+    """
+    extras = set(_extra_drone_indices(model_data))
+    flat = {"hull_premium": _money(rating_constants.DRONE_INACTIVE_FLAT_PREMIUM), "tpl_layer_premium": 0.0}
+    drones = [{**d, **flat} if i in extras else dict(d) for i, d in enumerate(model_data["drones"])]
+    return {**model_data, "drones": drones}
+
+
+def with_camera_extension(model_data: dict) -> dict:
+    """
+    Return a new policy with Extension 2 applied (extras get a flat £50 NET).
+    """
+    extras = set(_extra_camera_indices(model_data))
+    flat = {"hull_premium": _money(rating_constants.CAMERA_INACTIVE_FLAT_PREMIUM)}
+    cams = [{**c, **flat} if i in extras else dict(c) for i, c in enumerate(model_data["detachable_cameras"])]
+    return {**model_data, "detachable_cameras": cams}
+
+
+def with_totals(model_data: dict) -> dict:
+    """
+    Return a new policy with the NET & GROSS totals filled.
+    """
+    net_prem, gross_prem = _totals(model_data)
+    return {
+        **model_data,
+        "net_prem": {**model_data.get("net_prem", {}), **net_prem},
+        "gross_prem": {**model_data.get("gross_prem", {}), **gross_prem},
+    }
+
+
+def rate_policy(model_data: dict, extensions: bool = False) -> dict:
+    """
+    Rate a whole policy the same way as main(), returning a new result.
+    extensions=True also applies Extension 1 & 2 before the totals.
+    """
+    result = rated_cameras(rated_drones(model_data))
+
+    if extensions:
+        result = with_camera_extension(with_drone_extension(result))
+
+    return with_totals(result)
+
+
+def rate_policies(policies, max_workers: int = None, extensions: bool = False, monitor=None) -> list:
+    """
+    Rate many policies concurrently on a thread pool (results keep the input order).
+    Inputs are never mutated, so policies can be shared with other threads.
+    Threads only run in parallel on a free-threaded (no-GIL) build of CPython.
+    Policies are submitted CHECK_EVERY at a time, checking the optional memory monitor's budget after each batch.
+    """
+    policies = iter(policies)
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            batch = list(islice(policies, CHECK_EVERY))
+            if not batch:
+                return results
+            results.extend(pool.map(lambda p: rate_policy(p, extensions=extensions), batch))
+            if monitor is not None:
+                monitor.check("rate_policies")
@@ -0,0 +1,156 @@
+"""
+Rate-plan compiler for the drone lines.
+- HULL premium = value x (HULL_BASE_RATE x WEIGHT_ADJUSTMENT[weight])
+- TPL premium  = value x (TPL_BASE_RATE x ILF[(limit, excess)])
+- The bracketed coefficients only depend on the rate tables, so they are compiled once
+  and rating a drone becomes a lookup and a multiply (rounded exactly as in modelling_case_study).
+- The plan is recompiled automatically whenever rating_constants changes.
+"""
+
+from decimal import Decimal, getcontext
+from typing import NamedTuple
+
+import rating_constants
+from modelling_case_study import _money
+from memory_report import CHECK_EVERY
+from pure_rating import rated_cameras, with_drone_extension, with_camera_extension, with_totals
+
+
+class RatePlan(NamedTuple):
+    """
+    Compiled coefficients.
+    - hull: weight band -> (coefficient, precomputed float rate fields)
+    - tpl: (limit, excess) -> (coefficient, precomputed float rate fields)
+    - exact_limit: int values below this multiply exactly in one step (no change in rounding)
+    """
+    hull: dict
+    tpl: dict
+    exact_limit: int
+    fingerprint: tuple
+
+
+_PLAN = None
+
+
+def _fingerprint() -> tuple:
+    """
+    Snapshot of the rate tables, used to spot when the plan is stale.
+    """
+    return (
+        rating_constants.HULL_BASE_RATE,
+        tuple(rating_constants.WEIGHT_ADJUSTMENT.items()),
+        rating_constants.TPL_BASE_RATE,
+        tuple(rating_constants.TPL_ILF.items()),
+    )
+
+
+def _digits(d: Decimal) -> int:
+    return len(d.as_tuple().digits)
+
+
+def compile_rate_plan() -> RatePlan:
+    """
+    Compile rating_constants into a RatePlan.
+    """
+    hull_base = rating_constants.HULL_BASE_RATE
+    tpl_base = rating_constants.TPL_BASE_RATE
+
+    hull = {}
+    for weight, adj in rating_constants.WEIGHT_ADJUSTMENT.items():
+        coef = hull_base * adj
+        hull[weight] = (coef, {
+            "hull_base_rate": float(hull_base),
+            "hull_weight_adjustment": float(adj),
+            "hull_final_rate": float(coef),
+        })
+
+    # Keys stay as Decimal (limit, excess) - ints/floats hash & compare equal so lookups need no conversion
+    tpl = {}
+    for key, ilf in rating_constants.TPL_ILF.items():
+        tpl[key] = (tpl_base * ilf, {
+            "tpl_base_rate": float(tpl_base),
+            "tpl_ilf": float(ilf),
+        })
+
+    # value x coefficient is exact (so matches the reference's two-step product) while it fits in the context precision
+    widest = max([_digits(c) for c, _ in hull.values()] + [_digits(c) for c, _ in tpl.values()] + [_digits(tpl_base)])
+    exact_limit = 10 ** max(getcontext().prec - widest, 0)
+
+    return RatePlan(hull, tpl, exact_limit, _fingerprint())
+
+
+def get_rate_plan() -> RatePlan:
+    """
+    Return the compiled plan, recompiling it if the rate tables have changed.
+    Fetch it once per batch and pass it in, rather than once per drone.
+    """
+    global _PLAN
+    if _PLAN is None or _PLAN.fingerprint != _fingerprint():
+        _PLAN = compile_rate_plan()
+    return _PLAN
+
+
+def hull_premium(value, weight: str, plan: RatePlan = None) -> float:
+    """
+    HULL premium (NET, 2dp) for one drone.
+    """
+    plan = plan or get_rate_plan()
+    coef = plan.hull[weight][0]
+    return _money(Decimal(value) * coef)
+
+
+def tpl_layer_premium(value, limit, excess, plan: RatePlan = None) -> float:
+    """
+    TPL layer premium (NET, 2dp) for one drone.
+    """
+    plan = plan or get_rate_plan()
+    coef = plan.tpl[(limit, excess)][0]
+
+    if type(value) is int and abs(value) < plan.exact_limit:
+        return _money(Decimal(value) * coef)
+
+    # Outside the exact range, keep the reference order of operations: (value x base) x ILF
+    ilf = rating_constants.TPL_ILF[(limit, excess)]
+    return _money(Decimal(value) * rating_constants.TPL_BASE_RATE * ilf)
+
+
+def rated_drone(drone: dict, plan: RatePlan = None) -> dict:
+    """
+    Return a new drone with the HULL & TPL fields filled from the compiled plan.
+    Same fields & values as rate_hull_for_drone + rate_tpl_for_drone.
+    """
+    plan = plan or get_rate_plan()
+    value = drone["value"]
+    key = (drone["tpl_limit"], drone["tpl_excess"])
+
+    hull_coef, hull_rates = plan.hull[drone["weight"]]
+    tpl_rates = plan.tpl[key][1]
+
+    return {
+        **drone,
+        **hull_rates,
+        "hull_premium": _money(Decimal(value) * hull_coef),
+        **tpl_rates,
+        "tpl_base_layer_premium": _money(Decimal(value) * rating_constants.TPL_BASE_RATE),
+        "tpl_layer_premium": tpl_layer_premium(value, *key, plan=plan),
+    }
+
+
+def rate_policy(model_data: dict, plan: RatePlan = None, extensions: bool = False, monitor=None) -> dict:
+    """
+    Same as pure_rating.rate_policy, but rating the drones from the compiled plan.
+    The optional memory monitor's budget is checked every CHECK_EVERY drones.
+    """
+    plan = plan or get_rate_plan()
+    drones = []
+    for i, d in enumerate(model_data["drones"], 1):
+        drones.append(rated_drone(d, plan))
+        if monitor is not None and i % CHECK_EVERY == 0:
+            monitor.check("rate_plan.drones")
+    result = {**model_data, "drones": drones}
+    result = rated_cameras(result)
+
+    if extensions:
+        result = with_camera_extension(with_drone_extension(result))
+
+    return with_totals(result)
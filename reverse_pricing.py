@@ -0,0 +1,167 @@
+"""
+Reverse pricing: find the brokerage, or the uniform hull-rate loading, that reaches a target GROSS total.
+- GROSS = NET / (1 - brokerage), rounded to 2dp ROUND_HALF_UP, so the gross is a step function.
+- Brokerage: NET doesn't depend on it, so the solver starts from the closed form 1 - NET / target and
+  rounds it to as few decimals as still rate to the target exactly (up to MAX_BROKERAGE_DECIMALS).
+- Hull loading: each drone's hull final rate becomes base x weight adjustment x multiplier,
+  so cameras (charged at the highest eligible drone hull rate) are loaded too. TPL is unchanged.
+  The multiplier is found by bisection on a per-policy grid, sized from the policy's hull exposure so
+  one grid step moves the unrounded GROSS by less than half a penny. The solver returns the smallest
+  grid value whose rounded GROSS total reaches the target.
+- Both flag whether the target is hit to the penny (some pennies can't be reached, e.g. when several
+  lines round up at the same loading).
+- Many policies are solved at once: every round evaluates all unsolved policies together.
+- Evaluation goes through the same pipeline as the rating functions, including the extensions.
+NOTE: Assumes GROSS rises with the brokerage / loading, which holds unless an extension flat
+premium is above a kept drone's premium.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+from modelling_case_study import _money, _net_sums, _net_and_gross
+from pure_rating import rated_drones, rated_cameras, with_drone_extension, with_camera_extension
+
+# Brokerage is given to at most this many decimals (still round-trips through float)
+MAX_BROKERAGE_DECIMALS = 15
+
+# Multipliers are solved on a grid of 10^-decimals, at least this fine
+MIN_GRID_DECIMALS = 6
+MAX_MULTIPLIER = 1000
+
+HALF_PENNY = Decimal("0.005")
+
+
+def _from_grid(k: int, decimals: int) -> Decimal:
+    return Decimal(k).scaleb(-decimals)
+
+
+def _bisect(evaluate, targets: list, lo: list, hi: list) -> list:
+    """
+    Lockstep bisection over the grid for every policy.
+    Finds the smallest k in [lo, hi] with evaluate(i, k) >= target (hi when none is).
+    """
+    lo, hi = list(lo), list(hi)
+    active = [i for i in range(len(targets)) if lo[i] < hi[i]]
+
+    while active:
+        for i in active:
+            mid = (lo[i] + hi[i]) // 2
+            if evaluate(i, mid) >= targets[i]:
+                hi[i] = mid
+            else:
+                lo[i] = mid + 1
+        active = [i for i in active if lo[i] < hi[i]]
+
+    return hi
+
+
+def _gross_total(net: dict, brokerage) -> Decimal:
+    return Decimal(str(_net_and_gross(net, brokerage)[1]["total"]))
+
+
+def solve_brokerage(policies: list, targets: list, extensions: bool = False) -> list:
+    """
+    Brokerage needed for each policy to reach its target GROSS total.
+    Returns [{"brokerage": Decimal, "gross_total": float, "hit": bool}, ...] in input order.
+    When the target can't be hit (e.g. it is below NET) the closest brokerage in [0, 1) is returned.
+    """
+    targets = [Decimal(str(t)) for t in targets]
+
+    # NET doesn't depend on brokerage, so each policy is only rated once
+    nets = []
+    for policy in policies:
+        rated = rated_cameras(rated_drones(policy))
+        if extensions:
+            rated = with_camera_extension(with_drone_extension(rated))
+        nets.append(_net_sums(rated))
+
+    # Closed form: GROSS = NET / (1 - b)  =>  b = 1 - NET / GROSS (clamped to [0, 1))
+    exact = []
+    for net, target in zip(nets, targets):
+        net_total = net["drones_hull"] + net["drones_tpl"] + net["cameras_hull"]
+        b = Decimal("1") - net_total / target if target > 0 else Decimal("0")
+        exact.append(min(max(b, Decimal("0")), Decimal("1") - Decimal(1).scaleb(-MAX_BROKERAGE_DECIMALS)))
+
+    # Round the closed form to as few decimals as still hit the target, for all policies together
+    found = [None] * len(nets)
+    active = list(range(len(nets)))
+    for decimals in range(MAX_BROKERAGE_DECIMALS + 1):
+        step = Decimal(1).scaleb(-decimals)
+        for i in active:
+            rounded = exact[i].quantize(step, rounding=ROUND_HALF_UP)
+            for b in (rounded, rounded - step, rounded + step):
+                if 0 <= b < 1 and _gross_total(nets[i], b) == targets[i]:
+                    found[i] = b
+                    break
+        active = [i for i in active if found[i] is None]
+
+    results = []
+    for i, b in enumerate(found):
+        b = b if b is not None else exact[i].quantize(Decimal(1).scaleb(-MAX_BROKERAGE_DECIMALS), rounding=ROUND_HALF_UP)
+        gross = _gross_total(nets[i], b)
+        results.append({"brokerage": b, "gross_total": float(gross), "hit": gross == targets[i]})
+    return results
+
+
+def _loaded_gross(rated: dict, multiplier: Decimal, extensions: bool) -> Decimal:
+    """
+    GROSS total of a drone-rated policy with every hull final rate loaded by multiplier.
+    """
+    drones = []
+    for d in rated["drones"]:
+        final_rate = Decimal(str(d["hull_base_rate"])) * Decimal(str(d["hull_weight_adjustment"])) * multiplier
+        drones.append({**d, "hull_final_rate": float(final_rate), "hull_premium": _money(Decimal(d["value"]) * final_rate)})
+
+    loaded = rated_cameras({**rated, "drones": drones})
+    if extensions:
+        loaded = with_camera_extension(with_drone_extension(loaded))
+    return _gross_total(_net_sums(loaded), loaded["brokerage"])
+
+
+def _grid_decimals(rated: dict) -> int:
+    """
+    Grid decimals for the multiplier so one step moves the unrounded GROSS by under half a penny.
+    GROSS moves by (hull exposure of drones + cameras) / (1 - brokerage) per unit of multiplier.
+    """
+    coefs = [Decimal(str(d["hull_base_rate"])) * Decimal(str(d["hull_weight_adjustment"])) for d in rated["drones"]]
+    exposure = sum(Decimal(d["value"]) * c for d, c in zip(rated["drones"], coefs))
+
+    eligible = [c for d, c in zip(rated["drones"], coefs) if d.get("has_detachable_camera")]
+    if eligible:
+        exposure += sum(Decimal(cam["value"]) for cam in rated["detachable_cameras"]) * max(eligible)
+
+    slope = exposure / (Decimal("1") - Decimal(str(rated["brokerage"])))
+    decimals = MIN_GRID_DECIMALS
+    while slope.scaleb(-decimals) >= HALF_PENNY:
+        decimals += 1
+    return decimals
+
+
+def solve_rate_multiplier(policies: list, targets: list, extensions: bool = False) -> list:
+    """
+    Uniform hull-rate multiplier needed for each policy to reach its target GROSS total.
+    Returns [{"multiplier": Decimal, "gross_total": float, "hit": bool}, ...] in input order.
+    """
+    targets = [Decimal(str(t)) for t in targets]
+    rated = [rated_drones(p) for p in policies]
+    decimals = [_grid_decimals(r) for r in rated]
+
+    def evaluate(i, k):
+        return _loaded_gross(rated[i], _from_grid(k, decimals[i]), extensions)
+
+    # Grow the upper bound (from x1) until it reaches the target, for all policies together
+    one = [10 ** d for d in decimals]
+    hi = list(one)
+    growing = list(range(len(rated)))
+    while growing:
+        growing = [i for i in growing if hi[i] < MAX_MULTIPLIER * one[i] and evaluate(i, hi[i]) < targets[i]]
+        for i in growing:
+            hi[i] = min(hi[i] * 2, MAX_MULTIPLIER * one[i])
+
+    ks = _bisect(evaluate, targets, [0] * len(rated), hi)
+
+    results = []
+    for i, k in enumerate(ks):
+        gross = evaluate(i, k)
+        results.append({"multiplier": _from_grid(k, decimals[i]), "gross_total": float(gross), "hit": gross == targets[i]})
+    return results
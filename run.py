@@ -1,10 +1,36 @@
 """
 Simple runner to print out the current model data.
+    python run.py                      # rated example data
+    python run.py --memory             # + memory report per rating stage (stderr)
+    python run.py --memory-budget 512  # fail if memory goes over 512 MB
 """
 
+import argparse
 import json
-from modelling_case_study import main
+import sys
+from modelling_case_study import main, get_example_data
+from memory_report import MemoryMonitor, MemoryBudgetExceeded, profile_rating, format_report
 
 if __name__ == "__main__":
-    model_data = main()
-    print(json.dumps(model_data, indent = 2))   # Pretty print the model data
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Rate the example UAV data.")
+    parser.add_argument("--memory", action="store_true", help="report memory use per rating stage")
+    parser.add_argument("--memory-budget", type=float, metavar="MB", help="fail fast if memory use goes over this many MB")
+    args = parser.parse_args()
+
+    if args.memory or args.memory_budget is not None:
+        budget = int(args.memory_budget * 1024 * 1024) if args.memory_budget is not None else None
+        # tracemalloc is only needed for the --memory report; the budget alone just samples RSS
+        monitor = MemoryMonitor(budget_bytes=budget, trace=args.memory)
+        try:
+            model_data, reports = profile_rating(get_example_data(), monitor)
+        except MemoryBudgetExceeded as exc:
+            print(f"Memory budget exceeded in stage '{exc.stage}': "
+                  f"{exc.used_bytes / 1024 ** 2:,.1f} MB used, budget is {exc.budget_bytes / 1024 ** 2:,.1f} MB",
+                  file=sys.stderr)
+            sys.exit(1)
+        if args.memory:
+            print(format_report(reports), file=sys.stderr)
+    else:
+        model_data = main()
+
+    print(json.dumps(model_data, indent = 2))   # Pretty print the model data
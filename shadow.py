@@ -0,0 +1,288 @@
+"""
+Shadow-mode reconciliation of fast rating paths against the Decimal reference.
+- A configurable sample of policies is re-rated through a frozen copy of the original
+  in-place calculations (below) on a background executor.
+- The frozen reference deliberately does not call the helpers in modelling_case_study
+  (_hull_fields, _camera_fields, _totals, _extra_*_indices, ...). pure_rating, rate_plan
+  and the public functions in modelling_case_study all share those helpers, so a fault
+  in one of them shows up here as a mismatch instead of agreeing with itself.
+- Every line premium and every NET/GROSS total is compared to the penny.
+- Mismatches are kept as reports (and passed to an optional callback) and counted.
+  At most max_in_flight reconciliations are queued; further samples are dropped (and
+  counted) so a slow reference never builds up memory or holds up the primary path.
+"""
+
+import copy
+import random
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_HALF_UP
+
+import rating_constants
+
+
+DRONE_FIELDS = ("hull_premium", "tpl_layer_premium")
+CAMERA_FIELDS = ("hull_premium",)
+TOTAL_LINES = ("drones_hull", "drones_tpl", "cameras_hull", "total")
+
+
+# --- Frozen reference (the original in-place calculations - do not refactor onto shared helpers) ---
+
+def _money(x) -> float:
+    d = x if isinstance(x, Decimal) else Decimal(str(x))
+    return float(d.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def _reference_hull(drone: dict) -> None:
+    base = rating_constants.HULL_BASE_RATE
+    adj = rating_constants.WEIGHT_ADJUSTMENT[drone["weight"]]
+
+    final_rate = base * adj
+    premium = Decimal(drone["value"]) * final_rate
+
+    drone["hull_base_rate"] = float(base)
+    drone["hull_weight_adjustment"] = float(adj)
+    drone["hull_final_rate"] = float(final_rate)
+    drone["hull_premium"] = _money(premium)
+
+
+def _reference_tpl(drone: dict) -> None:
+    base_rate = rating_constants.TPL_BASE_RATE
+    base_layer_premium = Decimal(drone["value"]) * base_rate
+
+    ilf = rating_constants.TPL_ILF[(Decimal(drone["tpl_limit"]), Decimal(drone["tpl_excess"]))]
+    layer_prem = base_layer_premium * ilf
+
+    drone["tpl_base_rate"] = float(base_rate)
+    drone["tpl_base_layer_premium"] = _money(base_layer_premium)
+    drone["tpl_ilf"] = float(ilf)
+    drone["tpl_layer_premium"] = _money(layer_prem)
+
+
+def _reference_cameras(model_data: dict) -> None:
+    eligible = [d for d in model_data["drones"] if d.get("has_detachable_camera")]
+
+    if not eligible:
+        for cam in model_data["detachable_cameras"]:
+            cam["hull_rate"] = 0.0
+            cam["hull_premium"] = 0.0
+        return
+
+    max_rate = max(d["hull_final_rate"] for d in eligible)
+
+    for cam in model_data["detachable_cameras"]:
+        cam["hull_rate"] = float(max_rate)
+        cam["hull_premium"] = _money(Decimal(cam["value"]) * Decimal(str(max_rate)))
+
+
+def _reference_totals(model_data: dict) -> None:
+    net_drones_hull = sum(Decimal(str(d["hull_premium"])) for d in model_data["drones"])
+    net_drones_tpl = sum(Decimal(str(d["tpl_layer_premium"])) for d in model_data["drones"])
+    net_cameras_hull = sum(Decimal(str(cam["hull_premium"])) for cam in model_data["detachable_cameras"])
+    net_total = net_drones_hull + net_drones_tpl + net_cameras_hull
+
+    factor = Decimal("1") - Decimal(str(model_data["brokerage"]))
+    net = {"drones_hull": net_drones_hull, "drones_tpl": net_drones_tpl, "cameras_hull": net_cameras_hull, "total": net_total}
+
+    model_data["net_prem"] = {line: _money(value) for line, value in net.items()}
+    model_data["gross_prem"] = {line: _money(value / factor) for line, value in net.items()}
+
+
+def _reference_drone_extension(model_data: dict) -> None:
+    n = model_data["max_drones_in_air"]
+    drones = model_data["drones"]
+    if not drones:
+        return
+
+    top_n = sorted((d["hull_premium"] + d["tpl_layer_premium"] for d in drones), reverse=True)
+    if n > 0:
+        top_n = top_n[:n]
+        threshold = top_n[-1]
+    else:
+        threshold = top_n[0] + 1
+
+    for d in drones:
+        if d["hull_premium"] + d["tpl_layer_premium"] < threshold:
+            d["hull_premium"] = _money(rating_constants.DRONE_INACTIVE_FLAT_PREMIUM)
+            d["tpl_layer_premium"] = 0.0
+
+
+def _reference_camera_extension(model_data: dict) -> None:
+    cams = model_data["detachable_cameras"]
+    total_drones = len(model_data["drones"])
+    max_drones = model_data["max_drones_in_air"]
+
+    n = max_drones if total_drones >= max_drones else total_drones
+    if len(cams) <= n:
+        return
+
+    for cam in sorted(cams, key=lambda c: c["value"], reverse=True)[n:]:
+        cam["hull_premium"] = _money(rating_constants.CAMERA_INACTIVE_FLAT_PREMIUM)
+
+
+def reference_rate(model_data: dict, extensions: bool = False) -> dict:
+    """
+    Rate a copy of the policy with the frozen reference calculations, as main() does.
+    """
+    ref = copy.deepcopy(model_data)
+
+    for drone in ref["drones"]:
+        _reference_hull(drone)
+        _reference_tpl(drone)
+
+    _reference_cameras(ref)
+
+    if extensions:
+        _reference_drone_extension(ref)
+        _reference_camera_extension(ref)
+
+    _reference_totals(ref)
+    return ref
+
+
+def _same_penny(a, b) -> bool:
+    if a is None or b is None:
+        return a is b
+    return _money(a) == _money(b)
+
+
+def compare_results(reference: dict, fast: dict) -> list:
+    """
+    Compare a fast result to the reference result to the penny.
+    Returns a list of {"field", "reference", "fast"} for every difference.
+    """
+    mismatches = []
+
+    def check(field, ref_value, fast_value):
+        if not _same_penny(ref_value, fast_value):
+            mismatches.append({"field": field, "reference": ref_value, "fast": fast_value})
+
+    for key, fields in (("drones", DRONE_FIELDS), ("detachable_cameras", CAMERA_FIELDS)):
+        ref_items, fast_items = reference[key], fast.get(key, [])
+        if len(ref_items) != len(fast_items):
+            check(f"len({key})", len(ref_items), len(fast_items))
+            continue
+        for i, (ref_item, fast_item) in enumerate(zip(ref_items, fast_items)):
+            for field in fields:
+                check(f"{key}[{i}].{field}", ref_item[field], fast_item.get(field))
+
+    for basis in ("net_prem", "gross_prem"):
+        for line in TOTAL_LINES:
+            check(f"{basis}.{line}", reference[basis][line], fast.get(basis, {}).get(line))
+
+    return mismatches
+
+
+def reconcile(model_data: dict, fast: dict, extensions: bool = False) -> list:
+    """
+    Re-rate model_data through the reference and compare it with the fast result.
+    Module level so it can also run in a separate worker process.
+    """
+    return compare_results(reference_rate(model_data, extensions), fast)
+
+
+class ShadowReconciler:
+    """
+    Samples rated policies and reconciles them against the reference in the background.
+    - sample_rate: fraction of policies re-rated (0 to 1)
+    - executor: where reconciliation runs (default: a single background thread).
+      Pass a ProcessPoolExecutor to keep it off the primary process entirely.
+    - on_mismatch: optional callback(report) for each mismatching policy
+    - max_in_flight: most reconciliations queued or running at once; extra samples are dropped
+    Policies & results must not be mutated after being submitted (the pure API never does).
+    """
+
+    def __init__(self, sample_rate: float = 0.01, extensions: bool = False, executor=None,
+                 on_mismatch=None, max_reports: int = 1000, max_in_flight: int = 100, seed=None):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+        self.sample_rate = sample_rate
+        self.extensions = extensions
+        self.on_mismatch = on_mismatch
+        self.reports = deque(maxlen=max_reports)
+        self.max_in_flight = max_in_flight
+
+        self._counters = Counter()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+
+    @property
+    def counters(self) -> dict:
+        """
+        Snapshot of seen / sampled / dropped / matched / mismatched / errors.
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def submit(self, model_data: dict, fast: dict):
+        """
+        Queue a rated policy for reconciliation if it is sampled.
+        Returns the Future, or None if not sampled or dropped because max_in_flight are already queued.
+        """
+        with self._lock:
+            self._counters["seen"] += 1
+            if self._rng.random() >= self.sample_rate:
+                return None
+            self._counters["sampled"] += 1
+            if self._in_flight >= self.max_in_flight:
+                self._counters["dropped"] += 1
+                return None
+            self._in_flight += 1
+
+        future = self._executor.submit(reconcile, model_data, fast, self.extensions)
+        future.add_done_callback(lambda f: self._record(model_data, f))
+        return future
+
+    def rate(self, model_data: dict, rate_fn) -> dict:
+        """
+        Rate a policy on the primary path with rate_fn, shadowing the result.
+        """
+        result = rate_fn(model_data)
+        self.submit(model_data, result)
+        return result
+
+    def _record(self, model_data: dict, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+        try:
+            mismatches = future.result()
+        except Exception as exc:
+            with self._lock:
+                self._counters["errors"] += 1
+            self.reports.append({"policy": _policy_ref(model_data), "error": repr(exc)})
+            return
+
+        if not mismatches:
+            with self._lock:
+                self._counters["matched"] += 1
+            return
+
+        report = {"policy": _policy_ref(model_data), "mismatches": mismatches}
+        with self._lock:
+            self._counters["mismatched"] += 1
+        self.reports.append(report)
+        if self.on_mismatch is not None:
+            self.on_mismatch(report)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop the background executor (if owned), waiting for queued reconciliations by default.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _policy_ref(model_data: dict):
+    return model_data.get("policy_id", model_data.get("insured"))
@@ -36,6 +36,28 @@ class TestEdgeCases(unittest.TestCase):
         self.assertEqual(model_data["net_prem"]["drones_tpl"], D("0"))
 
     
+    def test_zero_drones_drone_extension(self):
+        """
+        1b) Zero Drones - Drone Extension
+        - With no drones there is no 'top n', so the drone extension does nothing (and doesn't crash).
+        """
+
+        model_data = get_example_data()
+        model_data["drones"] = []
+
+        rate_cameras(model_data)
+        apply_drone_extension(model_data)
+        compute_totals(model_data)
+
+        self.assertEqual(model_data["drones"], [])
+        self.assertEqual(model_data["net_prem"]["drones_hull"], D("0"))
+
+        # Also with max_drones_in_air = 0 (all drones would be extras)
+        model_data["max_drones_in_air"] = 0
+        apply_drone_extension(model_data)
+        self.assertEqual(model_data["drones"], [])
+
+
     def test_zero_cameras(self):
         """
         2) Zero Cameras
@@ -0,0 +1,62 @@
+import copy
+import unittest
+from decimal import Decimal
+from modelling_case_study import get_example_data, main, rate_hull_for_drone, rate_tpl_for_drone, rate_cameras, apply_drone_extension, apply_camera_extension, compute_totals
+from pure_rating import rated_hull, rated_tpl, rate_policy, rate_policies
+from tests.test_helpers import D, Q2
+
+
+class TestPureRating(unittest.TestCase):
+    """
+    This Test Checks:
+    - The pure API never mutates its input
+    - Results match the in-place functions exactly (with and without extensions)
+    - The thread pool returns the same results, in order
+    """
+
+    def test_inputs_untouched(self):
+        model_data = get_example_data()
+        snapshot = copy.deepcopy(model_data)
+
+        rated_hull(model_data["drones"][0])
+        rated_tpl(model_data["drones"][0])
+        rate_policy(model_data)
+        rate_policy(model_data, extensions=True)
+
+        self.assertEqual(model_data, snapshot)
+
+    def test_matches_main(self):
+        result = rate_policy(get_example_data())
+        self.assertEqual(result, main())
+
+        self.assertEqual(D(result["net_prem"]["total"]).quantize(Q2), D("4044.20"))
+        self.assertEqual(D(result["gross_prem"]["total"]).quantize(Q2), D("5777.43"))
+
+    def test_matches_in_place_extensions(self):
+        expected = get_example_data()
+        expected["max_drones_in_air"] = 1
+        for drone in expected["drones"]:
+            rate_hull_for_drone(drone)
+            rate_tpl_for_drone(drone)
+        rate_cameras(expected)
+        apply_drone_extension(expected)
+        apply_camera_extension(expected)
+        compute_totals(expected)
+
+        model_data = get_example_data()
+        model_data["max_drones_in_air"] = 1
+        self.assertEqual(rate_policy(model_data, extensions=True), expected)
+
+    def test_rate_policies_thread_pool(self):
+        shared = get_example_data()
+        policies = [shared] * 20
+
+        results = rate_policies(policies, max_workers=4)
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(result == main() for result in results))
+        self.assertEqual(shared, get_example_data())
+
+
+if __name__ == "__main__":
+    unittest.main()
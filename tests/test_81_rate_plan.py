@@ -0,0 +1,78 @@
+import unittest
+from decimal import Decimal
+import rating_constants
+from modelling_case_study import get_example_data, main, rate_hull_for_drone, rate_tpl_for_drone
+import rate_plan
+from rate_plan import get_rate_plan, rated_drone, rate_policy, hull_premium, tpl_layer_premium
+from tests.test_helpers import D, Q2
+
+
+class TestRatePlan(unittest.TestCase):
+    """
+    This Test Checks:
+    - Compiled coefficients give the same fields as the reference functions
+    - Rounding matches on values that land on a half penny
+    - The plan is rebuilt when the rate tables change
+    """
+
+    def test_drone_fields_match_reference(self):
+        plan = get_rate_plan()
+        for drone in get_example_data()["drones"]:
+            expected = rate_tpl_for_drone(rate_hull_for_drone(dict(drone)))
+            self.assertEqual(rated_drone(drone, plan), expected)
+
+    def test_policy_matches_main(self):
+        self.assertEqual(rate_policy(get_example_data()), main())
+
+    def test_rounding_matches_reference(self):
+        plan = get_rate_plan()
+        drone = get_example_data()["drones"][0]
+
+        # Values chosen so the unrounded premiums end in a half penny (plus a float & a huge int)
+        for value in (1, 25, 75, 125, 12345, 99999, 10000.5, 10 ** 26 + 7):
+            for weight in rating_constants.WEIGHT_ADJUSTMENT:
+                for limit, excess in rating_constants.TPL_ILF:
+                    d = {**drone, "value": value, "weight": weight, "tpl_limit": int(limit), "tpl_excess": int(excess)}
+                    expected = rate_tpl_for_drone(rate_hull_for_drone(dict(d)))
+                    self.assertEqual(hull_premium(value, weight, plan), expected["hull_premium"])
+                    self.assertEqual(tpl_layer_premium(value, int(limit), int(excess), plan), expected["tpl_layer_premium"])
+
+    def test_plan_rebuilt_when_tables_change(self):
+        plan = get_rate_plan()
+        self.assertIs(get_rate_plan(), plan)
+
+        rating_constants.WEIGHT_ADJUSTMENT["20 - 30kg"] = Decimal("2.00")
+        try:
+            rebuilt = get_rate_plan()
+            self.assertIsNot(rebuilt, plan)
+            self.assertEqual(D(hull_premium(10000, "20 - 30kg", rebuilt)).quantize(Q2), D("1200.00"))
+        finally:
+            del rating_constants.WEIGHT_ADJUSTMENT["20 - 30kg"]
+
+        self.assertNotIn("20 - 30kg", get_rate_plan().hull)
+
+    def test_replaced_constants_match_main(self):
+        """
+        Replacing a rate or table (not editing it in place) must move the plan and the reference together.
+        """
+        replacements = {
+            "HULL_BASE_RATE": Decimal("0.07"),
+            "TPL_BASE_RATE": Decimal("0.03"),
+            "WEIGHT_ADJUSTMENT": {**rating_constants.WEIGHT_ADJUSTMENT, "5 - 10kg": Decimal("1.30")},
+            "TPL_ILF": {**rating_constants.TPL_ILF, (Decimal("1000000"), Decimal("0")): Decimal("1.10")},
+        }
+        for name, replacement in replacements.items():
+            original = getattr(rating_constants, name)
+            setattr(rating_constants, name, replacement)
+            try:
+                result = rate_plan.rate_policy(get_example_data())
+                self.assertEqual(result, main(), name)
+                self.assertNotEqual(D(result["net_prem"]["total"]).quantize(Q2), D("4044.20"), name)
+            finally:
+                setattr(rating_constants, name, original)
+
+        self.assertEqual(rate_plan.rate_policy(get_example_data()), main())
+
+
+if __name__ == "__main__":
+    unittest.main()
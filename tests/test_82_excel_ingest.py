@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from modelling_case_study import get_example_data, main
+from tests.test_helpers import D, Q2
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+if openpyxl is not None:
+    from excel_ingest import rate_workbook, open_workbook, iter_drones
+
+
+def _write_workbook(path, model_data, totals=None):
+    """
+    Write model_data out in the layout excel_ingest expects.
+    """
+    wb = openpyxl.Workbook()
+    policy = wb.active
+    policy.title = "Policy"
+    for key in ("insured", "underwriter", "broker", "brokerage", "max_drones_in_air"):
+        policy.append([key, model_data[key]])
+
+    drones = wb.create_sheet("Drones")
+    drones.append(["Serial Number", "Value", "Weight", "Has Detachable Camera", "TPL Limit", "TPL Excess"])
+    for d in model_data["drones"]:
+        drones.append([d["serial_number"], d["value"], d["weight"], "Yes" if d["has_detachable_camera"] else "No", d["tpl_limit"], d["tpl_excess"]])
+
+    cams = wb.create_sheet("Cameras")
+    cams.append(["Serial Number", "Value"])
+    for c in model_data["detachable_cameras"]:
+        cams.append([c["serial_number"], c["value"]])
+
+    if totals is not None:
+        sheet = wb.create_sheet("Totals")
+        sheet.append(["Line", "NET", "GROSS"])
+        for line in ("drones_hull", "drones_tpl", "cameras_hull", "total"):
+            sheet.append([line, totals["net_prem"][line], totals["gross_prem"][line]])
+
+    wb.save(path)
+
+
+@unittest.skipIf(openpyxl is None, "openpyxl not installed")
+class TestExcelIngest(unittest.TestCase):
+    """
+    This Test Checks:
+    - A workbook of the example data streams to the golden totals
+    - Mismatches against the spreadsheet's own totals are reported
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "schedule.xlsx")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_example_workbook_matches_main(self):
+        expected = main()
+        _write_workbook(self.path, get_example_data(), totals=expected)
+
+        result = rate_workbook(self.path)
+
+        self.assertEqual(result["net_prem"], expected["net_prem"])
+        self.assertEqual(result["gross_prem"], expected["gross_prem"])
+        self.assertEqual((result["drone_count"], result["camera_count"]), (3, 4))
+        self.assertEqual(result["mismatches"], [])
+        self.assertEqual(D(result["gross_prem"]["total"]).quantize(Q2), D("5777.43"))
+
+    def test_drone_rows_parsed(self):
+        _write_workbook(self.path, get_example_data())
+        wb = open_workbook(self.path)
+        try:
+            drones = list(iter_drones(wb))
+        finally:
+            wb.close()
+
+        self.assertEqual([d["has_detachable_camera"] for d in drones], [True, False, True])
+        self.assertEqual(drones[1]["weight"], "10 - 20kg")
+
+    def test_mismatch_reported(self):
+        totals = main()
+        totals["gross_prem"]["total"] = 5777.44
+        _write_workbook(self.path, get_example_data(), totals=totals)
+
+        mismatches = rate_workbook(self.path)["mismatches"]
+
+        self.assertEqual(len(mismatches), 1)
+        self.assertEqual((mismatches[0]["basis"], mismatches[0]["line"]), ("gross_prem", "total"))
+
+
+if __name__ == "__main__":
+    unittest.main()
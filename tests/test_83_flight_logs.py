@@ -0,0 +1,70 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from modelling_case_study import get_example_data
+from pure_rating import rate_policy
+from flight_logs import peak_concurrent, peak_concurrent_chunks, peak_by_fleet, with_observed_peak, rate_policy_from_logs
+from tests.test_helpers import D, Q2
+
+
+class TestFlightLogs(unittest.TestCase):
+    """
+    This Test Checks:
+    - Peak concurrency from overlapping / touching intervals
+    - Chunked streaming gives the same peak
+    - Per-fleet processing
+    - The observed peak drives the extensions
+    """
+
+    def test_peak_concurrent(self):
+        self.assertEqual(peak_concurrent([]), 0)
+        self.assertEqual(peak_concurrent([(0, 10), (5, 15), (8, 9)]), 3)
+
+        # Landing at 10 and taking off at 10 do not overlap
+        self.assertEqual(peak_concurrent([(0, 10), (10, 20), (20, 30)]), 1)
+
+    def test_chunks_match_single_pass(self):
+        intervals = [(i % 97, i % 97 + (i % 13) + 1) for i in range(2000)]
+        chunks = [intervals[i:i + 128] for i in range(0, len(intervals), 128)]
+        self.assertEqual(peak_concurrent_chunks(iter(chunks)), peak_concurrent(intervals))
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            peak_concurrent([(10, 5)])
+
+    def test_peak_by_fleet(self):
+        fleets = {
+            "A": [[(0, 10), (1, 2)], [(1, 3)]],
+            "B": [[(0, 1), (1, 2), (2, 3)]],
+        }
+        self.assertEqual(peak_by_fleet(fleets, max_workers=2), {"A": 3, "B": 1})
+
+        # Real parallelism on a GIL build needs a process pool (chunks are picklable lists here)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            self.assertEqual(peak_by_fleet(fleets, executor=pool), {"A": 3, "B": 1})
+
+    def test_observed_peak_drives_extensions(self):
+        # Flight logs show only one drone in the air at a time (declared figure is 2)
+        logs = [[(0, 10), (10, 20)], [(20, 30)]]
+        result = rate_policy_from_logs(get_example_data(), logs)
+
+        expected = get_example_data()
+        expected["max_drones_in_air"] = 1
+        expected = rate_policy(expected, extensions=True)
+
+        self.assertEqual(result["max_drones_in_air"], 1)
+        self.assertEqual(result["declared_max_drones_in_air"], 2)
+        self.assertEqual(result["net_prem"], expected["net_prem"])
+
+        # Top drone 1152 + 2 x 150 flat, TPL kept only on the top drone (12000 * 0.02 * 0.53)
+        self.assertEqual(D(result["net_prem"]["drones_hull"]).quantize(Q2), D("1452.00"))
+        self.assertEqual(D(result["net_prem"]["drones_tpl"]).quantize(Q2), D("127.20"))
+
+    def test_with_observed_peak_is_pure(self):
+        model_data = get_example_data()
+        with_observed_peak(model_data, 5)
+        self.assertEqual(model_data["max_drones_in_air"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from decimal import Decimal
+import modelling_case_study
+import pure_rating
+import rating_constants
+from modelling_case_study import get_example_data, main
+from pure_rating import rate_policy
+import rate_plan
+from shadow import ShadowReconciler, reference_rate, compare_results
+
+
+class TestShadow(unittest.TestCase):
+    """
+    This Test Checks:
+    - The reference re-rate matches main() and leaves the input untouched
+    - Fast paths reconcile cleanly, with and without extensions
+    - A wrong line premium or total is reported & counted
+    - Sampling skips policies at sample_rate = 0
+    - Samples are dropped once max_in_flight are queued
+    - A fault in a helper shared by the fast paths and main() is caught,
+      while a change to the rate tables (read by both sides) is not
+    """
+
+    def test_reference_rate(self):
+        model_data = get_example_data()
+        self.assertEqual(reference_rate(model_data), main())
+        self.assertEqual(model_data, get_example_data())
+
+    def test_fast_paths_match(self):
+        model_data = get_example_data()
+        model_data["max_drones_in_air"] = 1
+        for extensions in (False, True):
+            ref = reference_rate(model_data, extensions)
+            self.assertEqual(compare_results(ref, rate_policy(model_data, extensions=extensions)), [])
+            self.assertEqual(compare_results(ref, rate_plan.rate_policy(model_data, extensions=extensions)), [])
+
+    def test_mismatches_reported(self):
+        model_data = get_example_data()
+        bad = rate_policy(model_data)
+        bad["drones"][1]["hull_premium"] += 0.01
+        bad["gross_prem"]["total"] = 5777.42
+
+        reports = []
+        with ShadowReconciler(sample_rate=1.0, on_mismatch=reports.append) as shadow:
+            shadow.submit(model_data, rate_policy(model_data))
+            shadow.submit(model_data, bad)
+
+        self.assertEqual(shadow.counters, {"seen": 2, "sampled": 2, "matched": 1, "mismatched": 1})
+        self.assertEqual(len(reports), 1)
+        fields = [m["field"] for m in reports[0]["mismatches"]]
+        self.assertEqual(fields, ["drones[1].hull_premium", "gross_prem.total"])
+
+    def test_sampling(self):
+        with ShadowReconciler(sample_rate=0.0) as shadow:
+            result = shadow.rate(get_example_data(), rate_plan.rate_policy)
+
+        self.assertEqual(result, main())
+        self.assertEqual(shadow.counters, {"seen": 1})
+
+    def test_dropped_when_backlog_full(self):
+        release = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=1)
+        pool.submit(release.wait)   # Hold the only worker so reconciliations queue up
+
+        model_data = get_example_data()
+        shadow = ShadowReconciler(sample_rate=1.0, executor=pool, max_in_flight=2)
+        futures = [shadow.submit(model_data, rate_policy(model_data)) for _ in range(5)]
+
+        self.assertEqual(sum(f is None for f in futures), 3)
+        self.assertEqual(shadow.counters["dropped"], 3)
+
+        release.set()
+        pool.shutdown(wait=True)
+        self.assertEqual(shadow.counters, {"seen": 5, "sampled": 5, "dropped": 3, "matched": 2})
+
+    def test_shared_helper_fault_caught(self):
+        def faulty_camera_fields(drones, cams):
+            return [{**f, "hull_premium": f["hull_premium"] + 0.01} for f in original(drones, cams)]
+
+        original = modelling_case_study._camera_fields
+        model_data = get_example_data()
+        with mock.patch.object(modelling_case_study, "_camera_fields", faulty_camera_fields), \
+             mock.patch.object(pure_rating, "_camera_fields", faulty_camera_fields):
+            fast = rate_policy(model_data)
+
+            # main() shares the helper, so it agrees with the faulty fast path...
+            self.assertEqual(fast, main())
+
+            # ...but the frozen reference does not
+            fields = [m["field"] for m in compare_results(reference_rate(model_data), fast)]
+
+        self.assertIn("detachable_cameras[0].hull_premium", fields)
+        self.assertIn("net_prem.cameras_hull", fields)
+        self.assertIn("gross_prem.total", fields)
+
+    def test_rate_table_change_not_caught(self):
+        # Both sides read rating_constants, so a wrong table is outside what the shadow can see
+        model_data = get_example_data()
+        with mock.patch.object(rating_constants, "HULL_BASE_RATE", Decimal("0.07")):
+            self.assertEqual(compare_results(reference_rate(model_data), rate_policy(model_data)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
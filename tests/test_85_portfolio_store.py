@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from modelling_case_study import get_example_data, main
+import rate_plan
+from portfolio_store import connect, bulk_load, iter_policy_chunks, write_results, rate_store
+from tests.test_helpers import D, Q2
+
+
+class TestPortfolioStore(unittest.TestCase):
+    """
+    This Test Checks:
+    - The store opens in WAL mode
+    - Policies round-trip through bulk load & chunked reads unchanged
+    - Rated totals are written back and match main()
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.conn = connect(os.path.join(self.tmp.name, "portfolio.db"))
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def test_wal_mode(self):
+        self.assertEqual(self.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_round_trip(self):
+        self.assertEqual(bulk_load(self.conn, [get_example_data() for _ in range(5)], batch_size=2), 5)
+
+        chunks = list(iter_policy_chunks(self.conn, chunk_size=2))
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+
+        example = get_example_data()
+        for i, policy in enumerate(p for c in chunks for p in c):
+            self.assertEqual(policy["policy_id"], i + 1)
+            self.assertEqual(policy["brokerage"], example["brokerage"])
+            self.assertEqual(policy["max_drones_in_air"], example["max_drones_in_air"])
+            self.assertEqual(policy["net_prem"], example["net_prem"])
+            for stored, original in zip(policy["drones"], example["drones"]):
+                for key in ("serial_number", "value", "weight", "has_detachable_camera", "tpl_limit", "tpl_excess"):
+                    self.assertEqual(stored[key], original[key])
+            self.assertEqual(policy["detachable_cameras"], [
+                {"serial_number": c["serial_number"], "value": c["value"]} for c in example["detachable_cameras"]
+            ])
+
+    def test_rate_and_write_back(self):
+        bulk_load(self.conn, [get_example_data() for _ in range(3)])
+
+        self.assertEqual(rate_store(self.conn, rate_fn=rate_plan.rate_policy, chunk_size=2), 3)
+
+        expected = main()
+        for policy in next(iter_policy_chunks(self.conn)):
+            self.assertEqual(policy["net_prem"], expected["net_prem"])
+            self.assertEqual(policy["gross_prem"], expected["gross_prem"])
+            self.assertEqual(D(policy["gross_prem"]["total"]).quantize(Q2), D("5777.43"))
+
+    def test_write_results_by_policy_id(self):
+        bulk_load(self.conn, [{**get_example_data(), "policy_id": 42}])
+        result = {**main(), "policy_id": 42}
+
+        self.assertEqual(write_results(self.conn, [result]), 1)
+        row = self.conn.execute("SELECT net_total, gross_total FROM policies WHERE policy_id = 42").fetchone()
+        self.assertEqual(row, (4044.2, 5777.43))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from decimal import Decimal
+from modelling_case_study import get_example_data, main
+from memory_report import MemoryMonitor, MemoryBudgetExceeded, profile_rating, format_report
+from portfolio_store import connect, bulk_load, rate_store
+from pure_rating import rate_policies
+
+
+class TestMemoryReport(unittest.TestCase):
+    """
+    This Test Checks:
+    - Each stage gets a report and rating results are unchanged
+    - A tiny budget fails fast, or calls the on_exceed hook instead
+    - tracemalloc is left as it was found, and not started at all for a budget-only monitor
+    - Batch runners check the budget per chunk
+    - run.py exits non-zero with a message (no traceback) over budget
+    """
+
+    def test_stage_reports(self):
+        model_data, reports = profile_rating(get_example_data(), extensions=True)
+
+        self.assertEqual([r["stage"] for r in reports], ["hull_tpl", "cameras", "drone_extension", "camera_extension", "totals"])
+        for r in reports:
+            self.assertEqual(r["drones"], 3)
+            self.assertGreaterEqual(r["peak_bytes"], r["net_bytes"])
+            self.assertIsNotNone(r["peak_per_1k_drones"])
+
+        self.assertIn("hull_tpl", format_report(reports))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_results_unchanged(self):
+        model_data, _ = profile_rating(get_example_data())
+        self.assertEqual(model_data, main())
+
+    def test_budget_fails_fast(self):
+        with self.assertRaises(MemoryBudgetExceeded):
+            profile_rating(get_example_data(), MemoryMonitor(budget_bytes=1))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_budget_on_exceed_hook(self):
+        exceeded = []
+        monitor = MemoryMonitor(budget_bytes=1, on_exceed=lambda stage, used: exceeded.append(stage))
+
+        model_data, _ = profile_rating(get_example_data(), monitor)
+
+        self.assertEqual(exceeded, ["hull_tpl", "cameras", "totals"])
+        self.assertEqual(model_data, main())
+
+    def test_budget_only_skips_tracemalloc(self):
+        started = []
+        monitor = MemoryMonitor(budget_bytes=1, trace=False, on_exceed=lambda stage, used: started.append(tracemalloc.is_tracing()))
+
+        model_data, reports = profile_rating(get_example_data(), monitor)
+
+        self.assertEqual(reports, [])
+        self.assertEqual(started, [False, False, False])
+        self.assertEqual(model_data, main())
+
+    def test_rate_store_budget(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = connect(os.path.join(tmp, "portfolio.db"))
+            try:
+                bulk_load(conn, [get_example_data() for _ in range(5)])
+
+                # Fails fast on the first chunk, before anything is written back
+                with self.assertRaises(MemoryBudgetExceeded) as ctx:
+                    rate_store(conn, chunk_size=2, monitor=MemoryMonitor(budget_bytes=1, trace=False))
+                self.assertEqual(ctx.exception.stage, "rate_store")
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM policies WHERE net_total IS NOT NULL").fetchone()[0], 0)
+
+                # With a spill hook, it is called once per chunk and the run completes
+                chunks = []
+                monitor = MemoryMonitor(budget_bytes=1, trace=False, on_exceed=lambda stage, used: chunks.append(stage))
+                self.assertEqual(rate_store(conn, chunk_size=2, monitor=monitor), 5)
+                self.assertEqual(chunks, ["rate_store"] * 3)
+            finally:
+                conn.close()
+
+    def test_rate_policies_budget(self):
+        with self.assertRaises(MemoryBudgetExceeded):
+            rate_policies([get_example_data()] * 3, monitor=MemoryMonitor(budget_bytes=1, trace=False))
+
+    def test_run_py_over_budget(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run([sys.executable, "run.py", "--memory-budget", "1"], cwd=root, capture_output=True, text=True)
+
+        self.assertNotEqual(proc.returncode, 0)
+        self.assertIn("Memory budget exceeded in stage 'hull_tpl'", proc.stderr)
+        self.assertNotIn("Traceback", proc.stderr)
+        self.assertEqual(proc.stdout, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
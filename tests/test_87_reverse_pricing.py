@@ -0,0 +1,94 @@
+import unittest
+from decimal import Decimal
+from modelling_case_study import get_example_data
+from pure_rating import rate_policy
+from reverse_pricing import solve_brokerage, solve_rate_multiplier
+from tests.test_helpers import D, Q2
+
+
+class TestReversePricing(unittest.TestCase):
+    """
+    This Test Checks:
+    - Solving for the example's own gross gives back its brokerage / x1 hull rates
+    - Solved brokerage re-rates to the target GROSS (with & without extensions)
+    - Hull loading x2 doubles hull & camera premiums
+    - Unreachable targets are flagged
+    - Large policies (x1000 values) still hit targets to the penny
+    """
+
+    @staticmethod
+    def large_policy():
+        policy = get_example_data()
+        for item in policy["drones"] + policy["detachable_cameras"]:
+            item["value"] *= 1000
+        return policy
+
+    def test_brokerage_round_trip(self):
+        policies = [get_example_data(), get_example_data()]
+        results = solve_brokerage(policies, [5777.43, 6000.00])
+
+        self.assertTrue(all(r["hit"] for r in results))
+        # 1 - 4044.20 / 5777.43 = 0.30000 -> the closed form rounds back to the example's brokerage
+        self.assertEqual(results[0]["brokerage"], D("0.3"))
+
+        for policy, result, target in zip(policies, results, ("5777.43", "6000.00")):
+            rated = rate_policy({**policy, "brokerage": float(result["brokerage"])})
+            self.assertEqual(D(rated["gross_prem"]["total"]).quantize(Q2), D(target))
+
+    def test_brokerage_between_grid_steps(self):
+        # 1 - 4044.20 / 7009.25 isn't on a 1e-6 grid (0.423020 gives 7009.26)
+        result = solve_brokerage([get_example_data()], [7009.25])[0]
+
+        self.assertTrue(result["hit"])
+        rated = rate_policy({**get_example_data(), "brokerage": float(result["brokerage"])})
+        self.assertEqual(D(rated["gross_prem"]["total"]).quantize(Q2), D("7009.25"))
+
+    def test_brokerage_with_extensions(self):
+        policy = get_example_data()
+        result = solve_brokerage([policy], [5000.00], extensions=True)[0]
+
+        self.assertTrue(result["hit"])
+        rated = rate_policy({**policy, "brokerage": float(result["brokerage"])}, extensions=True)
+        self.assertEqual(D(rated["gross_prem"]["total"]).quantize(Q2), D("5000.00"))
+
+    def test_rate_multiplier(self):
+        # x2 hull: drones hull 5664 + cameras 1584 + TPL 420.20 = 7668.20 NET -> 10954.57 GROSS
+        results = solve_rate_multiplier([get_example_data(), get_example_data()], [5777.43, 10954.57])
+
+        self.assertTrue(all(r["hit"] for r in results))
+        self.assertLessEqual(results[0]["multiplier"], D("1"))
+        self.assertLessEqual(results[1]["multiplier"], D("2"))
+        self.assertEqual(results[1]["gross_total"], 10954.57)
+
+    def test_rate_multiplier_with_extensions(self):
+        result = solve_rate_multiplier([get_example_data()], [6000.00], extensions=True)[0]
+        self.assertTrue(result["hit"])
+        self.assertEqual(result["gross_total"], 6000.00)
+
+    def test_large_policy_brokerage(self):
+        # One 1e-6 brokerage step moves this GROSS by ~8.25, so a fixed grid misses these pennies
+        targets = ["5777428.58", "6000000.01"]
+        results = solve_brokerage([self.large_policy(), self.large_policy()], [float(t) for t in targets])
+
+        self.assertTrue(all(r["hit"] for r in results))
+        for result, target in zip(results, targets):
+            rated = rate_policy({**self.large_policy(), "brokerage": float(result["brokerage"])})
+            self.assertEqual(D(rated["gross_prem"]["total"]).quantize(Q2), D(target))
+
+    def test_large_policy_rate_multiplier(self):
+        # One 1e-6 multiplier step moves this GROSS by ~5.17; the grid is refined from the hull exposure
+        result = solve_rate_multiplier([self.large_policy()], [8000000.01])[0]
+
+        self.assertTrue(result["hit"])
+        self.assertEqual(result["gross_total"], 8000000.01)
+        self.assertGreater(-result["multiplier"].as_tuple().exponent, 6)
+
+    def test_unreachable_target(self):
+        # Below the NET total, even 0% brokerage overshoots
+        result = solve_brokerage([get_example_data()], [100.00])[0]
+        self.assertEqual(result["brokerage"], D("0"))
+        self.assertFalse(result["hit"])
+
+
+if __name__ == "__main__":
+    unittest.main()